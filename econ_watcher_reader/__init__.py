@@ -1 +1,6 @@
-from .reader import EconomyWatcherReader
\ No newline at end of file
+def __getattr__(name):
+    # EconomyWatcherReader is imported lazily, so that records module can be used without pandas.
+    if name == 'EconomyWatcherReader':
+        from .reader import EconomyWatcherReader
+        return EconomyWatcherReader
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
@@ -0,0 +1,214 @@
+"""
+Backfill economy watcher data with multiple workers sharing only a directory.
+
+Layout of the directory:
+
+- manifest.json: kind of data and the months of each shard.
+- shard-NNNN.claim: created exclusively by the worker processing the shard.
+- shard-NNNN.pkl: parsed data of the shard.
+- shard-NNNN.done: written after the data of the shard is saved.
+"""
+import json
+import os
+import socket
+import time
+from typing import List
+import pandas as pd
+from econ_watcher_reader.settings import BACKFILL_SHARD_SIZE, BACKFILL_CLAIM_TIMEOUT_SECONDS
+from logging import getLogger
+logger = getLogger(__name__)
+
+MANIFEST_FILE_NAME = 'manifest.json'
+MONTH_FORMAT = '%Y-%m-%d'
+
+
+def create_manifest(reader, kind_: str, directory: str, shard_size: int = BACKFILL_SHARD_SIZE,
+                    start=None, end=None) -> dict:
+    """
+    Split available months of the reader into shards, and write the manifest into the directory.
+    If the manifest already exists, it is returned as it is, so every worker can call this method.
+
+    :param EconomyWatcherReader reader: reader to get the month catalog.
+    :param str kind_: The kind of the economy watcher data, future or current.
+    :param str directory: directory shared by workers.
+    :param int shard_size: number of months in a shard.
+    :param datetime start: The first month to backfill. If None passed, the earliest available month.
+    :param datetime end: The last month to backfill. If None passed, the latest available month.
+    :return: manifest
+    """
+    os.makedirs(directory, exist_ok=True)
+    manifest_path = os.path.join(directory, MANIFEST_FILE_NAME)
+    if os.path.exists(manifest_path):
+        return load_manifest(directory)
+
+    start = reader.EARLIEST_MONTH if start is None else start
+    end = reader.LATEST_MONTH if end is None else end
+    months = sorted(month for month in reader.AVAILABLE_PERIOD if start <= month <= end)
+    months = [month.strftime(MONTH_FORMAT) for month in months]
+
+    manifest = {
+        'kind': kind_,
+        'shards': [months[i:i + shard_size] for i in range(0, len(months), shard_size)],
+    }
+
+    # write to a temporary file and link it, so that other workers never read a partial manifest.
+    # link fails if the manifest exists, so only the first worker creates it.
+    tmp_path = '{}.{}.tmp'.format(manifest_path, _default_worker_id())
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    try:
+        os.link(tmp_path, manifest_path)
+        logger.info('created manifest with %d shards' % len(manifest['shards']))
+    except FileExistsError:
+        logger.info('manifest was created by another worker')
+    finally:
+        os.remove(tmp_path)
+
+    return load_manifest(directory)
+
+
+def load_manifest(directory: str) -> dict:
+    """
+    Read the manifest in the directory.
+
+    :param str directory: directory shared by workers.
+    :return: manifest
+    """
+    with open(os.path.join(directory, MANIFEST_FILE_NAME)) as f:
+        return json.load(f)
+
+
+def run_worker(reader, directory: str, worker_id: str = None,
+               claim_timeout: float = BACKFILL_CLAIM_TIMEOUT_SECONDS) -> List[int]:
+    """
+    Claim shards not processed yet, and save data of them into the directory.
+    Claims older than claim_timeout are regarded as abandoned by a dead worker and taken over.
+
+    :param EconomyWatcherReader reader: reader to get data.
+    :param str directory: directory shared by workers.
+    :param str worker_id: name of the worker written in claim files. The default is hostname and process id.
+    :param float claim_timeout: seconds to regard a claim as abandoned.
+    :return: list of shard numbers processed by this worker.
+    """
+    worker_id = _default_worker_id() if worker_id is None else worker_id
+    manifest = load_manifest(directory)
+
+    processed = []
+    for shard_id, months in enumerate(manifest['shards']):
+        if os.path.exists(_shard_path(directory, shard_id, 'done')):
+            continue
+        if not _claim_shard(directory, shard_id, worker_id, claim_timeout):
+            continue
+        # another worker may have completed the shard before this worker took over its claim.
+        if os.path.exists(_shard_path(directory, shard_id, 'done')):
+            continue
+
+        logger.info('worker {} processes shard {}: {} - {}'.format(worker_id, shard_id, months[0], months[-1]))
+        try:
+            data = reader.get_data(
+                manifest['kind'],
+                pd.to_datetime(months[0], format=MONTH_FORMAT),
+                pd.to_datetime(months[-1], format=MONTH_FORMAT)
+            )
+        except Exception:
+            # release the claim, so that other workers can retry the shard without waiting for the timeout.
+            _release_claim(directory, shard_id, worker_id)
+            raise
+
+        # temporary file is per worker, not to be mixed with a worker which took over the claim.
+        data_path = _shard_path(directory, shard_id, 'pkl')
+        tmp_path = '{}.{}.tmp'.format(data_path, worker_id)
+        data.to_pickle(tmp_path)
+        os.replace(tmp_path, data_path)
+
+        with open(_shard_path(directory, shard_id, 'done'), 'w') as f:
+            json.dump({'worker_id': worker_id, 'months': months, 'rows': len(data)}, f)
+        processed.append(shard_id)
+
+    return processed
+
+
+def merge_shards(directory: str) -> pd.DataFrame:
+    """
+    Merge data of all shards, and validate every month in the manifest is included.
+
+    :param str directory: directory shared by workers.
+    :return pd.DataFrame: merged data.
+    """
+    manifest = load_manifest(directory)
+
+    not_done = [
+        shard_id for shard_id in range(len(manifest['shards']))
+        if not os.path.exists(_shard_path(directory, shard_id, 'done'))
+    ]
+    if not_done:
+        raise ValueError('Shards {} are not completed.'.format(not_done))
+
+    data = pd.concat(
+        [pd.read_pickle(_shard_path(directory, shard_id, 'pkl')) for shard_id in range(len(manifest['shards']))]
+    ).sort_index()
+
+    if not data.index.is_unique:
+        raise ValueError('Merged data has duplicated index.')
+
+    months_in_data = set(data.index.get_level_values('date').strftime(MONTH_FORMAT))
+    missing_months = [month for months in manifest['shards'] for month in months if month not in months_in_data]
+    if missing_months:
+        raise ValueError('Data on {} are missing.'.format(missing_months))
+
+    return data
+
+
+def _claim_shard(directory: str, shard_id: int, worker_id: str, claim_timeout: float) -> bool:
+    """
+    Create claim file of the shard exclusively.
+
+    :return: True if this worker claimed the shard.
+    """
+    claim_path = _shard_path(directory, shard_id, 'claim')
+    try:
+        fd = os.open(claim_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        try:
+            is_abandoned = time.time() - os.path.getmtime(claim_path) > claim_timeout
+        except FileNotFoundError:
+            is_abandoned = False
+        if not is_abandoned:
+            return False
+
+        # rename is atomic, so only one worker can take over the abandoned claim.
+        try:
+            os.rename(claim_path, '{}.{}.abandoned'.format(claim_path, worker_id))
+        except FileNotFoundError:
+            return False
+        logger.warning('worker {} takes over abandoned shard {}'.format(worker_id, shard_id))
+        return _claim_shard(directory, shard_id, worker_id, claim_timeout)
+
+    with os.fdopen(fd, 'w') as f:
+        f.write(worker_id)
+    return True
+
+
+def _release_claim(directory: str, shard_id: int, worker_id: str) -> None:
+    """
+    Remove claim file of the shard, only if it is still held by the worker.
+    """
+    claim_path = _shard_path(directory, shard_id, 'claim')
+    try:
+        with open(claim_path) as f:
+            holder = f.read()
+    except FileNotFoundError:
+        return
+
+    if holder == worker_id:
+        os.remove(claim_path)
+    else:
+        logger.warning('claim of shard {} was taken over by {}'.format(shard_id, holder))
+
+
+def _shard_path(directory: str, shard_id: int, extension: str) -> str:
+    return os.path.join(directory, 'shard-{:04d}.{}'.format(shard_id, extension))
+
+
+def _default_worker_id() -> str:
+    return '{}-{}'.format(socket.gethostname(), os.getpid())
@@ -0,0 +1,143 @@
+"""
+Export reason sentences as one contiguous UTF-8 buffer with aligned metadata, and load it by memory map.
+Processes loading the same directory share the pages of the files.
+
+Layout of the directory:
+
+- sentences.bin: UTF-8 encoded sentences concatenated without separator.
+- offsets.npy: int64 array of length n + 1. Sentence i is sentences.bin[offsets[i]:offsets[i + 1]].
+- date.npy, score.npy: metadata of each sentence.
+- region.npy, industry.npy: int32 codes of each sentence. Values are in categories.json, and -1 means missing.
+"""
+import json
+import mmap
+import os
+import numpy as np
+from logging import getLogger
+logger = getLogger(__name__)
+
+SENTENCES_FILE_NAME = 'sentences.bin'
+OFFSETS_FILE_NAME = 'offsets.npy'
+CATEGORIES_FILE_NAME = 'categories.json'
+CATEGORICAL_COLUMNS = ['region', 'industry']
+
+
+def export_sentence_corpus(data, directory: str) -> None:
+    """
+    Export reason sentences and metadata of data returned by EconomyWatcherReader.get_data.
+
+    :param pd.DataFrame data: DataFrame returned by EconomyWatcherReader.get_data.
+    :param str directory: directory to write files.
+    :return: None
+    """
+    import pandas as pd
+
+    os.makedirs(directory, exist_ok=True)
+    data = data.reset_index()
+
+    encoded = [sentence.encode('utf-8') for sentence in data.reason_sentence]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(sentence) for sentence in encoded], out=offsets[1:])
+
+    with open(os.path.join(directory, SENTENCES_FILE_NAME), 'wb') as f:
+        f.write(b''.join(encoded))
+    np.save(os.path.join(directory, OFFSETS_FILE_NAME), offsets)
+
+    np.save(os.path.join(directory, 'date.npy'), data.date.values.astype('datetime64[D]'))
+    np.save(os.path.join(directory, 'score.npy'), data.score.values.astype(np.float64))
+
+    categories = {}
+    for column in CATEGORICAL_COLUMNS:
+        codes, uniques = pd.factorize(data[column])
+        np.save(os.path.join(directory, column + '.npy'), codes.astype(np.int32))
+        categories[column] = [str(value) for value in uniques]
+    with open(os.path.join(directory, CATEGORIES_FILE_NAME), 'w', encoding='utf-8') as f:
+        json.dump(categories, f, ensure_ascii=False)
+
+    logger.info('exported %d sentences into %s' % (len(encoded), directory))
+
+
+class SentenceCorpus(object):
+    """
+    Sentences and metadata exported by export_sentence_corpus, loaded by memory map.
+    Sentences are decoded only when accessed.
+    """
+
+    def __init__(self, directory: str):
+        """
+        :param str directory: directory written by export_sentence_corpus.
+        """
+        self.__file = open(os.path.join(directory, SENTENCES_FILE_NAME), 'rb')
+        # empty file can not be mapped
+        if os.fstat(self.__file.fileno()).st_size > 0:
+            self.__buffer = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self.__buffer = b''
+
+        self.__offsets = np.load(os.path.join(directory, OFFSETS_FILE_NAME), mmap_mode='r')
+        self.__date = np.load(os.path.join(directory, 'date.npy'), mmap_mode='r')
+        self.__score = np.load(os.path.join(directory, 'score.npy'), mmap_mode='r')
+        self.__codes = {
+            column: np.load(os.path.join(directory, column + '.npy'), mmap_mode='r') for column in CATEGORICAL_COLUMNS
+        }
+        with open(os.path.join(directory, CATEGORIES_FILE_NAME), encoding='utf-8') as f:
+            self.__categories = json.load(f)
+
+    def __len__(self) -> int:
+        return len(self.__offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        if not -len(self) <= i < len(self):
+            raise IndexError('sentence index out of range')
+        i = i % len(self)
+        return self.__buffer[self.__offsets[i]:self.__offsets[i + 1]].decode('utf-8')
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def close(self) -> None:
+        if isinstance(self.__buffer, mmap.mmap):
+            self.__buffer.close()
+        self.__file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def categories(self, column: str) -> list:
+        """
+        Values of codes in the column.
+
+        :param str column: 'region' or 'industry'.
+        :return: list of values. codes[i] is the index of the value of sentence i, and -1 means missing.
+        """
+        return self.__categories[column]
+
+    @property
+    def buffer(self) -> memoryview:
+        """
+        UTF-8 encoded sentences without copy.
+        """
+        return memoryview(self.__buffer)
+
+    @property
+    def offsets(self) -> np.ndarray:
+        return self.__offsets
+
+    @property
+    def date(self) -> np.ndarray:
+        return self.__date
+
+    @property
+    def score(self) -> np.ndarray:
+        return self.__score
+
+    @property
+    def region(self) -> np.ndarray:
+        return self.__codes['region']
+
+    @property
+    def industry(self) -> np.ndarray:
+        return self.__codes['industry']
@@ -1,9 +1,56 @@
 import numpy as np
 import pandas as pd
-from econ_watcher_reader.settings import TOKYO_FLAG_VALUE_IN_RAW_DATA
+import re
+from typing import Callable
+from econ_watcher_reader.settings import TOKYO_FLAG_VALUE_IN_RAW_DATA, REGION_PATTERN_IN_FIELD,\
+    REGION_WITH_PARENTHESIS_PATTERN_IN_FIELD
 from logging import getLogger
 logger = getLogger(__name__)
 
+REGION_PATTERN = re.compile(REGION_PATTERN_IN_FIELD)
+REGION_IN_FIELD_PATTERN = re.compile(REGION_WITH_PARENTHESIS_PATTERN_IN_FIELD)
+
+# cache of transformed field values, shared across months. {raw field value: transformed value}
+_region_memo = {}
+_cleaned_field_memo = {}
+
+
+def _transform_unique_values(column: pd.Series, transform: Callable, memo: dict) -> pd.Series:
+    """
+    Apply transform to each unique value in the column, and map results back to rows.
+    Results are stored in memo, so values seen in previous calls are not transformed again.
+
+    :param pd.Series column: column to transform. NaN is kept as NaN.
+    :param transform: function takes a value and returns the transformed value.
+    :param dict memo: cache of transformed values.
+    :return: transformed column.
+    """
+    codes, uniques = pd.factorize(column)
+
+    # the last element is for NaN, whose code is -1
+    transformed = np.empty(len(uniques) + 1, dtype=object)
+    transformed[-1] = np.nan
+    for i, value in enumerate(uniques):
+        try:
+            transformed[i] = memo[value]
+        except KeyError:
+            transformed[i] = memo[value] = transform(value)
+
+    return pd.Series(transformed[codes], index=column.index, name=column.name)
+
+
+def _extract_region(field: str):
+    if not isinstance(field, str):
+        return np.nan
+    matched = REGION_PATTERN.search(field)
+    return np.nan if matched is None else matched.group(0)
+
+
+def _clean_field(field: str):
+    if not isinstance(field, str):
+        return np.nan
+    return REGION_IN_FIELD_PATTERN.sub('', field).strip()
+
 
 def eliminate_rows_with_na_in_economic_status(watcher_file: pd.DataFrame,
                                               iloc_economic_status_score: int
@@ -48,18 +95,25 @@ def build_is_tokyo_flag(watcher_file: pd.DataFrame, iloc_is_tokyo_flag: int) ->
     return watcher_file
 
 
-def make_field_column(watcher_file: pd.DataFrame, iloc_field: int) -> pd.DataFrame:
+def make_field_column(watcher_file: pd.DataFrame, iloc_field: int, group_level=None) -> pd.DataFrame:
     """
     Make field column.
     Fill na value in field column using ffill method in pandas.
 
     :param pd.DataFrame watcher_file: DataFrame downloaded by scraper.get_watcher_file.
     :param int iloc_field: the column number of field in raw data.
+    :param group_level: level of the index to group rows by, such as month of concatenated raw data.
+    If passed, values are not filled across groups.
     :return: DataFrame with field column
     """
-    watcher_file = watcher_file.assign(
-        field=lambda x: x.iloc[:, iloc_field].fillna(method='ffill')
-    )
+    if group_level is None:
+        watcher_file = watcher_file.assign(
+            field=lambda x: x.iloc[:, iloc_field].fillna(method='ffill')
+        )
+    else:
+        watcher_file = watcher_file.assign(
+            field=lambda x: x.iloc[:, iloc_field].groupby(level=group_level).ffill()
+        )
     return watcher_file
 
 
@@ -69,6 +123,7 @@ def clean_field_column(watcher_file_with_field: pd.DataFrame) -> pd.DataFrame:
     This method should be called after creating 'region' column,
     because the part '(Prefecture name)' in field column is used to make 'region' column.
     If you do not need 'region' column, you do not have to care about it.
+    Like make_region_column, cleaning runs once per unique value of field.
 
     :param pd.DataFrame watcher_file_with_field: DataFrame object with field column created by make_field_column.
     :return: DataFrame with cleaned field column.
@@ -78,7 +133,7 @@ def clean_field_column(watcher_file_with_field: pd.DataFrame) -> pd.DataFrame:
                        'This method assumed to be called after creating `region` column.')
 
     watcher_file_with_field = watcher_file_with_field.assign(
-        field=lambda x: x.field.str.replace(r'(\(.*?\))','').str.strip()
+        field=lambda x: _transform_unique_values(x.field, _clean_field, _cleaned_field_memo)
     )
     return watcher_file_with_field
 
@@ -89,12 +144,13 @@ def make_region_column(watcher_file_with_field: pd.DataFrame) -> pd.DataFrame:
     Because the values in the field column have region name in parenthesis like `Field Name`(),
     this method extracts string in the parenthesis.
     So, this method might not work if the format of raw data would be changed.
+    The extraction runs once per unique value of field, and results are cached across calls.
 
     :param watcher_file_with_field: DataFrame object with field column created by make_field_column.
     :return: DataFrame with region column.
     """
     watcher_file = watcher_file_with_field.assign(
-        region=lambda x: x.field.str.extract(r'((?<=\().*?(?=\)))')
+        region=lambda x: _transform_unique_values(x.field, _extract_region, _region_memo)
     )
     return watcher_file
 
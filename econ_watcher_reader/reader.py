@@ -1,10 +1,24 @@
 from econ_watcher_reader.settings import TOP_MENU_PAGE, WatcherType
 import pandas as pd
+import bisect
 import datetime
+import os
+from typing import List, NamedTuple
 from econ_watcher_reader import scraper, parser
 from logging import getLogger
 logger = getLogger(__name__)
 
+INDEX_NAMES = ['date', 'watcher_type', 'region', 'row_id']
+
+
+class FailedMonth(NamedTuple):
+    """
+    Month failed to download or parse in get_data.
+    """
+    month: datetime.datetime
+    watcher_type: WatcherType
+    error: Exception
+
 
 class EconomyWatcherReader(object):
     """
@@ -31,51 +45,152 @@ class EconomyWatcherReader(object):
             - For industry, reason_type, raw data are used.
             - For score, reason_sentence, field, region, columns defined in parse module used.
         1. Make date columns. This is not the same as publish date. [done]
+        1. Set sorted index of date, watcher type, region and row number in the raw data. [done]
     """
 
-    def __init__(self):
+    def __init__(self, scheduler: scraper.DownloadScheduler = None):
         """
         Initialize Data Reader.
+
+        :param scraper.DownloadScheduler scheduler: scheduler to pace downloads of multiple months.
+        If None passed, the default scheduler is used.
         """
+        self.__scheduler = scraper.DownloadScheduler() if scheduler is None else scheduler
+        self.__failed_months = []
         self.__set_available_period()
 
-    def __set_available_period(self) -> None:
+    def refresh_available_period(self, links_of_monthly_economy_watcher: List[str] = None) -> None:
+        """
+        Refresh available period, for example after a new month is published.
+
+        :param list links_of_monthly_economy_watcher: links got by scraper.get_watcher_directory.
+        If None passed, get them from the top page.
+        :return: None
+        """
+        self.__set_available_period(links_of_monthly_economy_watcher)
+
+    def __set_available_period(self, links_of_monthly_economy_watcher: List[str] = None) -> None:
         """
         Attribute setter method for available period.
+        Attributes are replaced only after all of them are built, so they are kept if it raises.
 
+        :param list links_of_monthly_economy_watcher: links got by scraper.get_watcher_directory.
+        If None passed, get them from the top page.
         :return: None
         """
-        links_of_monthly_economy_watcher = scraper.get_watcher_directory(TOP_MENU_PAGE)
+        if links_of_monthly_economy_watcher is None:
+            links_of_monthly_economy_watcher = scraper.get_watcher_directory(TOP_MENU_PAGE)
         logger.debug('links_of_monthly_economy_watcher: {}'.format(links_of_monthly_economy_watcher))
+        if not links_of_monthly_economy_watcher:
+            raise ValueError('No link of monthly economy watcher is found.')
+
         publish_date_list = [
             scraper.get_publish_date_from_url(link_) for link_ in links_of_monthly_economy_watcher
         ]
         logger.debug('publish_date_list: {}'.format(publish_date_list))
 
-        self.__AVAILABLE_PERIOD = pd.Series(
+        available_period = pd.Series(
             [self.__set_datetime_month_to_one(month) - pd.offsets.MonthBegin(1) for month in publish_date_list]
         )
-        logger.debug('AVAILABLE_PERIOD: {}'.format(self.__AVAILABLE_PERIOD.tolist()))
+        logger.debug('AVAILABLE_PERIOD: {}'.format(available_period.tolist()))
 
-        self.__map_month_to_url = {
-            month: url for month, url in zip(self.__AVAILABLE_PERIOD, links_of_monthly_economy_watcher)
+        map_month_to_url = {
+            month: url for month, url in zip(available_period, links_of_monthly_economy_watcher)
         }
-        logger.debug('map_month_to_url: {}'.format(self.__map_month_to_url))
+        logger.debug('map_month_to_url: {}'.format(map_month_to_url))
+
+        sorted_months = sorted(available_period)
 
-        self.__LATEST_MONTH = max(self.__AVAILABLE_PERIOD)
-        self.__EARLIEST_MONTH = min(self.__AVAILABLE_PERIOD)
+        self.__AVAILABLE_PERIOD = available_period
+        self.__map_month_to_url = map_month_to_url
+        self.__SORTED_MONTHS = sorted_months
+        self.__LATEST_MONTH = sorted_months[-1]
+        self.__EARLIEST_MONTH = sorted_months[0]
         logger.debug('LATEST_MONTH: {0}, EARLIEST_MONTH: {1}'.format(
             *[self.__LATEST_MONTH, self.__EARLIEST_MONTH])
         )
 
-    def get_data(self, kind_: str, start=None, end=None) -> pd.DataFrame:
+    def get_data(self, kind_: str, start=None, end=None, batch: bool = True,
+                 on_error: str = 'raise', checkpoint_dir: str = None, periods: list = None) -> pd.DataFrame:
         """
         The method to read economy watcher data.
 
         :param str kind_: The kind of the economy watcher data, future or current.
         :param datetime start: The first month of data to get. If None passed, returns all of the available data.
         :param datetime end: The last month of data to get. If None passed, returns data only on 'start' month. The default is None.
-        :return pd.DataFrame: The DataFame of the Economy Watcher Survey.
+        :param bool batch: If True, raw data of all months are parsed at once. Otherwise, parsed month by month.
+        :param str on_error: 'raise' or 'skip'. If 'skip', months failed to download or parse are skipped,
+        and they are reported by `failed_months`.
+        :param str checkpoint_dir: directory to save raw data of each month as soon as it is downloaded,
+        and data of each month as soon as it is parsed. Months saved in it are read from it instead of the web site.
+        :param list periods: list of months or (start, end) pairs as tuple or list, used instead of `start` and `end`.
+        Months overlapped among periods are read only once.
+        :return pd.DataFrame: The DataFame of the Economy Watcher Survey,
+        with sorted unique MultiIndex of (date, watcher_type, region, row_id).
+        """
+        if on_error not in ('raise', 'skip'):
+            raise ValueError('Invalid parameter was passed as `on_error`.'
+                             'It must be `raise` or `skip`.')
+
+        if periods is None:
+            data_range_to_get = self.__get_months_in_range(start, end)
+        elif start is not None or end is not None:
+            raise ValueError('`start` and `end` must be None if `periods` is passed.')
+        else:
+            months_to_get = set()
+            for period in periods:
+                if isinstance(period, (tuple, list)):
+                    if len(period) != 2:
+                        raise ValueError('Each range in `periods` must be (start, end).')
+                    months_to_get.update(self.__get_months_in_range(*period))
+                else:
+                    months_to_get.update(self.__get_months_in_range(period, period))
+            data_range_to_get = sorted(months_to_get)
+        logger.debug('data_range_to_get: {}'.format(data_range_to_get))
+
+        self.__failed_months = []
+        data_list=[]
+        watcher_types = self.__define_watcher_type(kind_)
+        for watcher_type in watcher_types:
+            months = list(data_range_to_get)
+
+            # Read months completed in the previous calls
+            if checkpoint_dir is not None:
+                checkpointed = self.__load_checkpoints(checkpoint_dir, months, watcher_type)
+                data_list.extend(checkpointed.values())
+                months = [month for month in months if month not in checkpointed]
+
+            # Get raw data from the we site of Cabinet Office
+            raw_data_list = self.__get_raw_data(months, watcher_type, on_error, checkpoint_dir)
+            months, raw_data_list = self.__exclude_failed_months(months, raw_data_list, watcher_type)
+
+            if not months:
+                continue
+
+            if batch:
+                data_list.extend(self.__read_raw_data_with_fallback(
+                    raw_data_list, months, watcher_type, on_error, checkpoint_dir
+                ))
+            else:
+                for month, data_to_parse in zip(months, raw_data_list):
+                    data_list.extend(self.__read_raw_data_with_fallback(
+                        [data_to_parse], [month], watcher_type, on_error, checkpoint_dir
+                    ))
+
+        if not data_list:
+            return pd.DataFrame(index=pd.MultiIndex.from_tuples([], names=INDEX_NAMES))
+
+        data = pd.concat(data_list).sort_index()
+
+        return data
+
+    def __get_months_in_range(self, start=None, end=None) -> list:
+        """
+        Get available months from `start` to `end` by binary search on the sorted months.
+
+        :param datetime start: The first month. If both `start` and `end` are None, all available months.
+        :param datetime end: The last month. If None passed, only `start` month.
+        :return: list of months.
         """
         # if both period parameters are None, get all available data.
         if start is None and end is None:
@@ -104,37 +219,154 @@ class EconomyWatcherReader(object):
                 end=end, earliest=self.__EARLIEST_MONTH, latest=self.__LATEST_MONTH
             ))
 
-        # set range to get data
-        available_period = self.__AVAILABLE_PERIOD
-        data_range_to_get = available_period[(start <= available_period) & (available_period <= end)]
-        logger.debug('data_range_to_get: {}'.format(data_range_to_get.tolist()))
+        return self.__SORTED_MONTHS[
+            bisect.bisect_left(self.__SORTED_MONTHS, start):bisect.bisect_right(self.__SORTED_MONTHS, end)
+        ]
 
-        data_list=[]
-        watcher_types = self.__define_watcher_type(kind_)
-        for watcher_type in watcher_types:
-            for month in data_range_to_get:
-                logger.info('read data at: {:%B-%y}'.format(month))
-
-                # Get raw data from the we site of Cabinet Office
-                data_to_parse = scraper.get_watcher_file(
-                    self.__map_month_to_url[month],
-                    watcher_type.file_name
-                )
-
-                # Parsing
-                parsed_data = self.__parse_data(data_to_parse, watcher_type)
-                logger.debug('parsed_data at {month}: {data}'.format(
-                    month=month ,data=parsed_data.head(),
-                ))
-                logger.debug('columns: %s' % parsed_data.columns)
+    def __get_raw_data(self, months: list, watcher_type: WatcherType, on_error: str = 'raise',
+                       checkpoint_dir: str = None) -> list:
+        """
+        Download raw data of the months.
+        If multiple months are requested, they are downloaded through the scheduler not to overload the server.
+
+        :param list months: months to download.
+        :param WatcherType watcher_type: type of the file to download.
+        :param str on_error: If 'skip', the exception is returned in place of the raw data of failed month.
+        If 'raise', the exception of the first failed month is raised after all of the months are downloaded.
+        :param str checkpoint_dir: directory to save raw data of each month as soon as it is downloaded.
+        Raw data saved in it are read instead of downloading.
+        :return: list of raw DataFrame in the same order as months.
+        """
+        scheduler = self.__scheduler if len(months) > 1 else None
+
+        def _get_watcher_file(month):
+            try:
+                if checkpoint_dir is None:
+                    return scraper.get_watcher_file(self.__map_month_to_url[month], watcher_type.file_name, scheduler)
+
+                path = self.__checkpoint_path(checkpoint_dir, month, watcher_type, raw=True)
+                if os.path.exists(path):
+                    return pd.read_pickle(path)
+                raw_data = scraper.get_watcher_file(self.__map_month_to_url[month], watcher_type.file_name, scheduler)
+                self.__save_pickle(raw_data, path)
+                return raw_data
+            except Exception as e:
+                if on_error == 'raise':
+                    raise
+                logger.warning('failed to download data at {:%B-%y}: {}'.format(month, e))
+                return e
+
+        if scheduler is None:
+            return [_get_watcher_file(month) for month in months]
+
+        return scheduler.map(_get_watcher_file, months)
+
+    def __exclude_failed_months(self, months: list, raw_data_list: list, watcher_type: WatcherType):
+        """
+        Record months failed to download, and return the others.
 
-                # Organize data
-                data = self.__organize_parsed_data(parsed_data, watcher_type, month)
-                data_list.append(data)
+        :return: months and raw data downloaded successfully.
+        """
+        succeeded = []
+        for month, raw_data in zip(months, raw_data_list):
+            if isinstance(raw_data, Exception):
+                self.__failed_months.append(FailedMonth(month, watcher_type, raw_data))
+            else:
+                succeeded.append((month, raw_data))
 
-        data = pd.concat(data_list)
+        return [month for month, _ in succeeded], [raw_data for _, raw_data in succeeded]
 
-        return data
+    def __read_raw_data_with_fallback(self, raw_data_list: list, months: list, watcher_type: WatcherType,
+                                      on_error: str, checkpoint_dir: str = None) -> list:
+        """
+        Parse and organize raw data of the months.
+        If it fails with on_error 'skip', parse month by month to find the failed months.
+        If checkpoint_dir is passed, data of the months are saved as soon as they are parsed.
+
+        :return: list of organized DataFrame.
+        """
+        try:
+            data = self.__read_raw_data(raw_data_list, months, watcher_type)
+            if checkpoint_dir is not None:
+                self.__save_checkpoints(checkpoint_dir, data, months, watcher_type)
+            return [data]
+        except Exception as e:
+            if on_error == 'raise':
+                raise
+            if len(months) == 1:
+                logger.warning('failed to parse data at {:%B-%y}: {}'.format(months[0], e))
+                self.__failed_months.append(FailedMonth(months[0], watcher_type, e))
+                return []
+
+        logger.warning('failed to parse data at once, retry month by month')
+        data_list = []
+        for month, data_to_parse in zip(months, raw_data_list):
+            data_list.extend(self.__read_raw_data_with_fallback(
+                [data_to_parse], [month], watcher_type, on_error, checkpoint_dir
+            ))
+        return data_list
+
+    @staticmethod
+    def __checkpoint_path(checkpoint_dir: str, month: datetime.datetime, watcher_type: WatcherType,
+                          raw: bool = False) -> str:
+        return os.path.join(checkpoint_dir, '{}-{:%Y%m}{}.pkl'.format(watcher_type.name, month, '.raw' if raw else ''))
+
+    @staticmethod
+    def __save_pickle(data: pd.DataFrame, path: str) -> None:
+        # write to a temporary file and rename, not to leave a partial file when the process is killed.
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        data.to_pickle(path + '.tmp')
+        os.replace(path + '.tmp', path)
+
+    def __load_checkpoints(self, checkpoint_dir: str, months: list, watcher_type: WatcherType) -> dict:
+        """
+        Read data of the months saved in the checkpoint directory.
+
+        :return: dict of month and organized DataFrame.
+        """
+        checkpointed = {}
+        for month in months:
+            path = self.__checkpoint_path(checkpoint_dir, month, watcher_type)
+            if os.path.exists(path):
+                checkpointed[month] = pd.read_pickle(path)
+        logger.info('read {} months from checkpoint'.format(len(checkpointed)))
+        return checkpointed
+
+    def __save_checkpoints(self, checkpoint_dir: str, data: pd.DataFrame, months: list,
+                           watcher_type: WatcherType) -> None:
+        """
+        Save data of each month into the checkpoint directory, and remove raw data no longer needed.
+        Months without rows are also saved, not to be downloaded again.
+        """
+        dates = data.index.get_level_values('date')
+        for month in months:
+            self.__save_pickle(data[dates == month], self.__checkpoint_path(checkpoint_dir, month, watcher_type))
+
+            raw_path = self.__checkpoint_path(checkpoint_dir, month, watcher_type, raw=True)
+            if os.path.exists(raw_path):
+                os.remove(raw_path)
+
+    def __read_raw_data(self, raw_data_list: list, months: list, watcher_type: WatcherType) -> pd.DataFrame:
+        """
+        Parse and organize raw data of the months in one pass.
+        Raw data are concatenated with the month as the first level of the index,
+        which keeps filling field column from bleeding across months.
+
+        :param list raw_data_list: list of raw DataFrame.
+        :param list months: months of each raw DataFrame.
+        :param WatcherType watcher_type: type of the raw data.
+        :return: organized DataFrame.
+        """
+        logger.info('read data at: {}'.format(', '.join('{:%B-%y}'.format(month) for month in months)))
+        data_to_parse = pd.concat(raw_data_list, keys=months, names=['date', 'row_id'])
+
+        # Parsing
+        parsed_data = self.__parse_data(data_to_parse, watcher_type)
+        logger.debug('parsed_data: {}'.format(parsed_data.head()))
+        logger.debug('columns: %s' % parsed_data.columns)
+
+        # Organize data
+        return self.__organize_parsed_data(parsed_data, watcher_type)
 
     @staticmethod
     def __define_watcher_type(kind_: str):
@@ -155,7 +387,7 @@ class EconomyWatcherReader(object):
         data = parser.eliminate_rows_with_na_in_economic_status(data_to_parse, watcher_type.iloc_economic_status_score)
         data = parser.eliminate_newline_code(data)
         data = parser.build_is_tokyo_flag(data, watcher_type.iloc_is_tokyo_flag)
-        data = parser.make_field_column(data, watcher_type.iloc_field)
+        data = parser.make_field_column(data, watcher_type.iloc_field, group_level='date')
         data = parser.make_region_column(data)
         data = parser.clean_field_column(data)
         data = parser.convert_economic_state_score_into_integer(data, watcher_type.iloc_economic_status_score, watcher_type.score_map)
@@ -164,10 +396,10 @@ class EconomyWatcherReader(object):
         return data
 
     @staticmethod
-    def __organize_parsed_data(parsed_data: pd.DataFrame, watcher_type: WatcherType, date_point:datetime.datetime):
+    def __organize_parsed_data(parsed_data: pd.DataFrame, watcher_type: WatcherType):
         """
 
-        :param parsed_data:
+        :param parsed_data: parsed DataFrame indexed by (date, row_id).
         :param watcher_type:
         :return:
         """
@@ -176,15 +408,26 @@ class EconomyWatcherReader(object):
         columns_to_use = raw_data_column + columns_made_in_parser
 
         parsed_data = parsed_data[columns_to_use].assign(
-            date=pd.to_datetime(date_point)
+            watcher_type=watcher_type.name,
         )
 
         # rename raw data column
         # parsed_data.rename(columns={raw_data_column[0]: 'industry', raw_data_column[1]: 'reason_type'}, inplace=True)
         parsed_data.rename(columns={iloc:watcher_type.get_name_from_iloc(iloc) for iloc in raw_data_column}, inplace=True)
+
+        # index by (date, watcher_type, region, row_id). row_id is the row number in the raw csv file.
+        # missing region is set to empty string, because NaN in the index breaks lexicographical sort.
+        parsed_data = parsed_data.reset_index().fillna({'region': ''}).set_index(INDEX_NAMES)
         logger.debug('{}'.format(parsed_data.dtypes))
         return parsed_data
 
+    @property
+    def failed_months(self) -> List[FailedMonth]:
+        """
+        Months skipped in the last call of get_data with on_error 'skip'.
+        """
+        return self.__failed_months
+
     @property
     def AVAILABLE_PERIOD(self) -> pd.Series:
         return self.__AVAILABLE_PERIOD
@@ -0,0 +1,212 @@
+"""
+Lightweight reader returns rows as plain records, without importing pandas and numpy.
+The cleaning follows the same steps as parser module.
+"""
+import csv
+import datetime
+import io
+import re
+from typing import Dict, List, NamedTuple, Optional
+import requests
+from econ_watcher_reader.settings import TOP_MENU_PAGE, WATCHER_DISTRIBUTE_DIRECTORY, TOKYO_FLAG_VALUE_IN_RAW_DATA,\
+    REGION_PATTERN_IN_FIELD, REGION_WITH_PARENTHESIS_PATTERN_IN_FIELD, REQUEST_TIMEOUT_SECONDS, WatcherType
+from econ_watcher_reader import scraper
+from logging import getLogger
+logger = getLogger(__name__)
+
+REGION_PATTERN = re.compile(REGION_PATTERN_IN_FIELD)
+REGION_IN_FIELD_PATTERN = re.compile(REGION_WITH_PARENTHESIS_PATTERN_IN_FIELD)
+
+
+class WatcherRecord(NamedTuple):
+    """
+    A row of economy watcher data. Fields are the same as index and columns of EconomyWatcherReader.get_data.
+    """
+    date: datetime.datetime
+    watcher_type: str
+    region: str
+    row_id: int
+    industry: Optional[str]
+    reason_type: Optional[str]
+    is_tokyo: bool
+    field: Optional[str]
+    score: int
+    reason_sentence: str
+
+
+def parse_records(content: bytes, watcher_type: WatcherType, date: datetime.datetime) -> List[WatcherRecord]:
+    """
+    Parse raw csv file into records.
+
+    :param bytes content: raw csv file downloaded from Cabinet Office web site.
+    :param WatcherType watcher_type: type of the file.
+    :param datetime date: month of the file.
+    :return: list of records.
+    """
+    records = []
+    field = None
+    for row_id, row in enumerate(_read_rows(content)):
+        # Eliminate rows without economic status score.
+        if _get(row, watcher_type.iloc_economic_status_score) is None:
+            continue
+
+        # Delete newline code.
+        row = [None if value is None else value.replace('\n', '').replace('\r', '') for value in row]
+
+        # Flag rows about Tokyo.
+        tokyo_flag = _get(row, watcher_type.iloc_is_tokyo_flag)
+        is_tokyo = tokyo_flag is not None and TOKYO_FLAG_VALUE_IN_RAW_DATA in tokyo_flag
+
+        # Make field column by filling the previous value.
+        if _get(row, watcher_type.iloc_field) is not None:
+            field = _get(row, watcher_type.iloc_field)
+
+        # Convert economic state score to integer.
+        score = watcher_type.score_map.get(_get(row, watcher_type.iloc_economic_status_score))
+        if score is None:
+            continue
+
+        # Eliminate rows without sentence, and delete center dot.
+        reason_sentence = _get(row, watcher_type.iloc_reason_sentence)
+        if reason_sentence is None or len(reason_sentence) <= 1:
+            continue
+
+        records.append(WatcherRecord(
+            date=date,
+            watcher_type=watcher_type.name,
+            region=_extract_region(field),
+            row_id=row_id,
+            industry=_get(row, watcher_type.iloc_industry),
+            reason_type=_get(row, watcher_type.iloc_reason_type),
+            is_tokyo=is_tokyo,
+            field=None if field is None else REGION_IN_FIELD_PATTERN.sub('', field).strip(),
+            score=score,
+            reason_sentence=reason_sentence.replace('・', '', 1),
+        ))
+
+    return records
+
+
+def to_columns(records: List[WatcherRecord]) -> Dict[str, list]:
+    """
+    Convert records into column arrays.
+
+    :param list records: list of records.
+    :return: dict of column name and list of values.
+    """
+    return {name: [getattr(record, name) for record in records] for name in WatcherRecord._fields}
+
+
+class RecordReader(object):
+    """
+    Data reader returns list of WatcherRecord instead of DataFrame.
+    """
+
+    def __init__(self, scheduler: scraper.DownloadScheduler = None):
+        """
+        Initialize Data Reader.
+
+        :param scraper.DownloadScheduler scheduler: scheduler to pace downloads of multiple months.
+        If None passed, the default scheduler is used.
+        """
+        self.__scheduler = scraper.DownloadScheduler() if scheduler is None else scheduler
+
+        links_of_monthly_economy_watcher = scraper.get_watcher_directory(TOP_MENU_PAGE)
+        self.__map_month_to_url = {
+            _previous_month(scraper.get_publish_date_from_url(link_)): link_
+            for link_ in links_of_monthly_economy_watcher
+        }
+        self.__AVAILABLE_PERIOD = sorted(self.__map_month_to_url)
+
+    def get_records(self, kind_: str, start=None, end=None) -> List[WatcherRecord]:
+        """
+        The method to read economy watcher data as records.
+
+        :param str kind_: The kind of the economy watcher data, future or current.
+        :param datetime start: The first month of data to get. If None passed, returns all of the available data.
+        :param datetime end: The last month of data to get. If None passed, returns data only on 'start' month.
+        :return: list of records sorted by date, region and row_id.
+        """
+        watcher_type = _define_watcher_type(kind_)
+
+        if start is None and end is None:
+            start, end = self.EARLIEST_MONTH, self.LATEST_MONTH
+        start = datetime.datetime(start.year, start.month, 1)
+        end = start if end is None else datetime.datetime(end.year, end.month, 1)
+
+        if start > end:
+            raise ValueError('`start` date must be before `end` date.')
+        if start < self.EARLIEST_MONTH or end > self.LATEST_MONTH:
+            raise ValueError('Data on {start:%B-%y} - {end:%B-%y} is not available. '
+                             'Available period: [{earliest:%B-%y} - {latest:%B-%y}]'.format(
+                start=start, end=end, earliest=self.EARLIEST_MONTH, latest=self.LATEST_MONTH
+            ))
+
+        months = [month for month in self.__AVAILABLE_PERIOD if start <= month <= end]
+        urls = [WATCHER_DISTRIBUTE_DIRECTORY + self.__map_month_to_url[month] + watcher_type.file_name
+                for month in months]
+        if len(urls) == 1:
+            response = requests.get(urls[0], timeout=REQUEST_TIMEOUT_SECONDS)
+            response.raise_for_status()
+            contents = [response.content]
+        else:
+            contents = self.__scheduler.map(self.__scheduler.fetch, urls)
+
+        records = []
+        for month, content in zip(months, contents):
+            logger.info('read records at: {:%B-%y}'.format(month))
+            records.extend(parse_records(content, watcher_type, month))
+
+        return sorted(records, key=lambda record: (record.date, record.region, record.row_id))
+
+    @property
+    def AVAILABLE_PERIOD(self) -> List[datetime.datetime]:
+        return self.__AVAILABLE_PERIOD
+
+    @property
+    def LATEST_MONTH(self) -> datetime.datetime:
+        return self.__AVAILABLE_PERIOD[-1]
+
+    @property
+    def EARLIEST_MONTH(self) -> datetime.datetime:
+        return self.__AVAILABLE_PERIOD[0]
+
+
+def _read_rows(content: bytes):
+    """
+    Read rows of csv like pandas.read_csv: blank lines are skipped and empty values are None.
+    """
+    for row in csv.reader(io.StringIO(content.decode('cp932'), newline='')):
+        if not row:
+            continue
+        yield [value if value != '' else None for value in row]
+
+
+def _get(row: list, iloc: Optional[int]) -> Optional[str]:
+    if iloc is None or iloc >= len(row):
+        return None
+    return row[iloc]
+
+
+def _extract_region(field: Optional[str]) -> str:
+    # missing region is empty string, same as index of EconomyWatcherReader.get_data
+    if field is None:
+        return ''
+    matched = REGION_PATTERN.search(field)
+    return '' if matched is None else matched.group(0)
+
+
+def _previous_month(publish_date: datetime.datetime) -> datetime.datetime:
+    if publish_date.month == 1:
+        return datetime.datetime(publish_date.year - 1, 12, 1)
+    return datetime.datetime(publish_date.year, publish_date.month - 1, 1)
+
+
+def _define_watcher_type(kind_: str) -> WatcherType:
+    if kind_ == 'current':
+        return WatcherType.Current
+    elif kind_ == 'future':
+        return WatcherType.Future
+    else:
+        raise ValueError('Invalid parameter was passed as `kind_`.'
+                         'It must be `current` or `future.`')
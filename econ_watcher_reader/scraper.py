@@ -1,10 +1,16 @@
 import requests
-from econ_watcher_reader.settings import WATCHER_DISTRIBUTE_DIRECTORY
+from econ_watcher_reader.settings import WATCHER_DISTRIBUTE_DIRECTORY, REQUEST_RATE_PER_SECOND, REQUEST_BURST,\
+    MAX_CONCURRENCY, SLOW_RESPONSE_SECONDS, HOST_BANDWIDTH_BUDGET, RETRY_STATUS_CODES, MAX_RETRIES,\
+    RETRY_BACKOFF_SECONDS, REQUEST_TIMEOUT_SECONDS
 from bs4 import BeautifulSoup
-import pandas as pd
+import io
 import os.path
 import re
-from typing import List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
 import datetime
 from logging import getLogger
 logger = getLogger(__name__)
@@ -22,28 +28,76 @@ def get_watcher_directory(menu_page: str) -> List[str]:
 
     logger.info('get watcher links from %s' % response.url)
 
-    soup = BeautifulSoup(response.content, features="html.parser")
-    links_ = soup.find_all('a', class_='bulletLink')
-    links_watcher = [os.path.dirname(link_.get('href')) + '/' for link_ in links_ if 'menu' in link_.get('href')]
+    links_watcher = parse_watcher_directory(response.content)
 
     logger.info('done')
     return links_watcher
 
 
-def get_watcher_file(link_: str, file_name: str) -> pd.DataFrame:
+def get_watcher_directory_if_modified(menu_page: str, etag: str = None, last_modified: str = None
+                                      ) -> Tuple[Optional[List[str]], Optional[str], Optional[str]]:
+    """
+    Get links same as get_watcher_directory, only if the top page was modified.
+    Conditional request is sent with ETag and Last-Modified returned by the previous call.
+
+    :param str menu_page: link of top page of economywatcher survey in Cabinet Office web site.
+    :param str etag: ETag returned by the previous call.
+    :param str last_modified: Last-Modified returned by the previous call.
+    :return: list of link strings or None if not modified, ETag and Last-Modified of the page.
+    """
+    headers = {}
+    if etag is not None:
+        headers['If-None-Match'] = etag
+    if last_modified is not None:
+        headers['If-Modified-Since'] = last_modified
+
+    response = requests.get(menu_page, headers=headers, timeout=REQUEST_TIMEOUT_SECONDS)
+    if response.status_code == 304:
+        logger.debug('not modified: %s' % menu_page)
+        return None, etag, last_modified
+    response.raise_for_status()
+
+    logger.info('get watcher links from %s' % response.url)
+    return (
+        parse_watcher_directory(response.content),
+        response.headers.get('ETag'),
+        response.headers.get('Last-Modified')
+    )
+
+
+def parse_watcher_directory(content: bytes) -> List[str]:
+    """
+    Parse links that distribute monthly economy watcher file from html of top page of economy watcher.
+
+    :param bytes content: html of the top page.
+    :return: list of link strings.
+    """
+    soup = BeautifulSoup(content, features="html.parser")
+    links_ = soup.find_all('a', class_='bulletLink')
+    return [os.path.dirname(link_.get('href')) + '/' for link_ in links_ if 'menu' in link_.get('href')]
+
+
+def get_watcher_file(link_: str, file_name: str, scheduler=None) -> 'pd.DataFrame':
     """
     Download watcher file by Cabinet Office web site.
     It returns pandas.DaraFrame object, although the raw file is csv.
 
     :param str link_: url of the economy watcher survey file.
     :param str file_name: file name to get. This should be defined in settings.WatcherType.
+    :param DownloadScheduler scheduler: scheduler to pace the request. If None passed, download directly.
     :return: downloaded file as DataFrame
     """
+    # pandas is imported here, so that records module can use this module without pandas.
+    import pandas as pd
+
     file_url = WATCHER_DISTRIBUTE_DIRECTORY + link_ + file_name
 
     logger.info('get watcher file from %s' % file_url)
 
-    data = pd.read_csv(file_url, header=None, encoding='cp932')
+    if scheduler is None:
+        data = pd.read_csv(file_url, header=None, encoding='cp932')
+    else:
+        data = pd.read_csv(io.BytesIO(scheduler.fetch(file_url)), header=None, encoding='cp932')
     return data
 
 
@@ -60,3 +114,187 @@ def get_publish_date_from_url(link_: str) -> datetime.datetime:
 
     logger.debug('yyyymmdd: {0}, date: {1:}'.format(*[yyyymmdd, pub_date]))
     return pub_date
+
+
+class TokenBucket(object):
+    """
+    Token bucket shared by threads.
+    Tokens are reserved in advance, so the balance can go negative and later callers wait for the debt to be refilled.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        :param float rate: tokens refilled per second.
+        :param float capacity: maximum number of tokens stored in the bucket.
+        """
+        self.__rate = rate
+        self.__capacity = capacity
+        self.__tokens = capacity
+        self.__last_refill = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def consume(self, amount: float = 1.0) -> float:
+        """
+        Take tokens from the bucket and sleep until they are paid back.
+
+        :param float amount: number of tokens to take.
+        :return: seconds slept.
+        """
+        with self.__lock:
+            now = time.monotonic()
+            self.__tokens = min(self.__capacity, self.__tokens + (now - self.__last_refill) * self.__rate)
+            self.__last_refill = now
+            self.__tokens -= amount
+            wait = max(0.0, -self.__tokens / self.__rate)
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class AdaptiveConcurrencyLimiter(object):
+    """
+    Limit the number of requests in flight.
+    The limit grows by one on each fast success and is halved on a slow or failed response (AIMD).
+    """
+
+    def __init__(self, max_concurrency: int, slow_response_seconds: float):
+        """
+        :param int max_concurrency: upper bound of the limit.
+        :param float slow_response_seconds: response time regarded as a sign of overload.
+        """
+        self.__max_concurrency = max_concurrency
+        self.__slow_response_seconds = slow_response_seconds
+        self.__limit = 1
+        self.__in_flight = 0
+        self.__condition = threading.Condition()
+
+    def acquire(self) -> None:
+        with self.__condition:
+            while self.__in_flight >= self.__limit:
+                self.__condition.wait()
+            self.__in_flight += 1
+
+    def release(self, succeeded: bool, elapsed: float) -> None:
+        """
+        Release a slot and adjust the limit by the result of the request.
+
+        :param bool succeeded: False if the server responded with throttling or server error.
+        :param float elapsed: response time in seconds.
+        """
+        with self.__condition:
+            self.__in_flight -= 1
+            if succeeded and elapsed < self.__slow_response_seconds:
+                self.__limit = min(self.__max_concurrency, self.__limit + 1)
+            else:
+                self.__limit = max(1, self.__limit // 2)
+                logger.info('back off concurrency to %d' % self.__limit)
+            self.__condition.notify_all()
+
+    @property
+    def limit(self) -> int:
+        return self.__limit
+
+
+class DownloadScheduler(object):
+    """
+    Polite downloader for bulk fetch from the Cabinet Office web site.
+
+    - Requests are paced by a token bucket.
+    - Concurrency adapts to the response of the server.
+    - Bytes received from each host are paced by its bandwidth budget.
+    """
+
+    def __init__(self,
+                 rate: float = REQUEST_RATE_PER_SECOND,
+                 burst: int = REQUEST_BURST,
+                 max_concurrency: int = MAX_CONCURRENCY,
+                 slow_response_seconds: float = SLOW_RESPONSE_SECONDS,
+                 host_bandwidth_budget: Dict[str, int] = None,
+                 max_retries: int = MAX_RETRIES,
+                 retry_backoff_seconds: float = RETRY_BACKOFF_SECONDS,
+                 timeout: float = REQUEST_TIMEOUT_SECONDS,
+                 session: requests.Session = None
+                 ):
+        """
+        :param float rate: requests per second.
+        :param int burst: number of requests allowed at once after idle time.
+        :param int max_concurrency: maximum number of requests in flight.
+        :param float slow_response_seconds: response time to reduce concurrency.
+        :param dict host_bandwidth_budget: bytes per second for each host. Hosts not in it are not limited.
+        :param int max_retries: number of retries on throttling, server error, connection error or timeout.
+        :param float retry_backoff_seconds: base seconds of exponential backoff between retries.
+        :param float timeout: seconds to wait for the server to connect and to send data.
+        :param requests.Session session: session to send requests.
+        """
+        if host_bandwidth_budget is None:
+            host_bandwidth_budget = HOST_BANDWIDTH_BUDGET
+
+        self.__request_bucket = TokenBucket(rate, burst)
+        self.__limiter = AdaptiveConcurrencyLimiter(max_concurrency, slow_response_seconds)
+        self.__bandwidth_buckets = {
+            host: TokenBucket(budget, budget) for host, budget in host_bandwidth_budget.items()
+        }
+        self.__max_concurrency = max_concurrency
+        self.__max_retries = max_retries
+        self.__retry_backoff_seconds = retry_backoff_seconds
+        self.__timeout = timeout
+        self.__session = requests.Session() if session is None else session
+
+    def fetch(self, url: str) -> bytes:
+        """
+        Download content of the url politely.
+
+        :param str url: url to download.
+        :return: content of the response.
+        """
+        bandwidth_bucket = self.__bandwidth_buckets.get(urlparse(url).hostname)
+
+        for attempt in range(self.__max_retries + 1):
+            self.__limiter.acquire()
+            self.__request_bucket.consume()
+            started = time.monotonic()
+            try:
+                response = self.__session.get(url, timeout=self.__timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self.__limiter.release(False, time.monotonic() - started)
+                if attempt == self.__max_retries:
+                    raise
+                logger.warning('{} on {}'.format(type(e).__name__, url))
+            except Exception:
+                # release the slot on unexpected errors too, not to block other requests forever.
+                self.__limiter.release(False, time.monotonic() - started)
+                raise
+            else:
+                retry = response.status_code in RETRY_STATUS_CODES
+                self.__limiter.release(not retry, time.monotonic() - started)
+                if bandwidth_bucket is not None:
+                    bandwidth_bucket.consume(len(response.content))
+
+                if not retry or attempt == self.__max_retries:
+                    response.raise_for_status()
+                    return response.content
+                logger.warning('status %d on %s' % (response.status_code, url))
+
+                retry_after = response.headers.get('Retry-After', '')
+                if retry_after.isdigit():
+                    time.sleep(int(retry_after))
+                    continue
+
+            time.sleep(self.__retry_backoff_seconds * 2 ** attempt)
+
+    def map(self, func: Callable, items: Iterable) -> list:
+        """
+        Apply func to items in worker threads. Results are returned in the order of items.
+        func is expected to download through this scheduler.
+        Even if func raises for some items, it is applied to all of the items,
+        and then the exception of the first item in the order is raised.
+
+        :param func: function to apply.
+        :param items: arguments of func.
+        :return: list of results.
+        """
+        with ThreadPoolExecutor(max_workers=self.__max_concurrency) as executor:
+            futures = [executor.submit(func, item) for item in items]
+            wait(futures)
+        return [future.result() for future in futures]
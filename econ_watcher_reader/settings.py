@@ -4,6 +4,26 @@ TOP_MENU_PAGE = 'https://www5.cao.go.jp/keizai3/watcher_index.html'
 OLD_MENU_PAGE = 'https://www5.cao.go.jp/keizai3/kako_watcher.html'
 WATCHER_DISTRIBUTE_DIRECTORY = 'https://www5.cao.go.jp/keizai3/'
 TOKYO_FLAG_VALUE_IN_RAW_DATA = '東京都'
+REGION_PATTERN_IN_FIELD = r'((?<=\().*?(?=\)))'
+REGION_WITH_PARENTHESIS_PATTERN_IN_FIELD = r'(\(.*?\))'
+
+# Politeness settings for bulk download from the Cabinet Office web site.
+REQUEST_RATE_PER_SECOND = 1.0
+REQUEST_BURST = 2
+MAX_CONCURRENCY = 4
+SLOW_RESPONSE_SECONDS = 5.0
+HOST_BANDWIDTH_BUDGET = {'www5.cao.go.jp': 512 * 1024}  # bytes per second
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+MAX_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 2.0
+REQUEST_TIMEOUT_SECONDS = 30.0
+
+# Settings for backfill shared by multiple workers.
+BACKFILL_SHARD_SIZE = 12  # months
+BACKFILL_CLAIM_TIMEOUT_SECONDS = 6 * 60 * 60
+
+# Interval to poll the top page for new publication.
+WATCH_INTERVAL_SECONDS = 10 * 60
 
 
 class WatcherType(Enum):
@@ -92,4 +112,4 @@ class WatcherType(Enum):
 
     @property
     def is_koshinetsu(self):
-        return 'Koshinetsu' in self.name
\ No newline at end of file
+        return 'Koshinetsu' in self.name
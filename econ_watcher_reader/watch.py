@@ -0,0 +1,89 @@
+import hashlib
+import time
+from typing import Callable, List
+from econ_watcher_reader.settings import TOP_MENU_PAGE, WATCH_INTERVAL_SECONDS
+from econ_watcher_reader import scraper
+from logging import getLogger
+logger = getLogger(__name__)
+
+
+class PublicationWatcher(object):
+    """
+    Watcher of new publication of the economy watcher survey.
+
+    The top page is polled with conditional request, and links in it are compared by hash.
+    Only when a new month appears, data of the month is read and passed to the callback.
+    """
+
+    def __init__(self, reader, kind_: str, callback: Callable, interval: float = WATCH_INTERVAL_SECONDS,
+                 menu_page: str = TOP_MENU_PAGE):
+        """
+        :param EconomyWatcherReader reader: reader to get data of new months.
+        :param str kind_: The kind of the economy watcher data, future or current.
+        :param callback: function called with the month and its DataFrame when a new month is published.
+        :param float interval: seconds between polls.
+        :param str menu_page: link of top page of economywatcher survey in Cabinet Office web site.
+        """
+        self.__reader = reader
+        self.__kind = kind_
+        self.__callback = callback
+        self.__interval = interval
+        self.__menu_page = menu_page
+
+        self.__etag = None
+        self.__last_modified = None
+        self.__links_digest = None
+        self.__known_months = set(reader.AVAILABLE_PERIOD)
+
+    def poll(self) -> List:
+        """
+        Check the top page once, and read data of new months if published.
+
+        :return: list of new months.
+        """
+        links_, etag, last_modified = scraper.get_watcher_directory_if_modified(
+            self.__menu_page, self.__etag, self.__last_modified
+        )
+        if links_ is None:
+            return []
+        if not links_:
+            # maintenance or error page. ETag and digest are not saved, to check the page again in the next poll.
+            logger.warning('no link is found in %s' % self.__menu_page)
+            return []
+
+        links_digest = hashlib.sha256('\n'.join(sorted(links_)).encode()).hexdigest()
+        if links_digest == self.__links_digest:
+            logger.debug('links are not changed')
+            return []
+
+        self.__reader.refresh_available_period(links_)
+        new_months = sorted(set(self.__reader.AVAILABLE_PERIOD) - self.__known_months)
+        for month in new_months:
+            logger.info('new publication: {:%B-%y}'.format(month))
+            self.__callback(month, self.__reader.get_data(self.__kind, month))
+            self.__known_months.add(month)
+
+        # the state of the page is saved only after all new months are delivered,
+        # so that months failed to be delivered are retried in the next poll.
+        self.__etag = etag
+        self.__last_modified = last_modified
+        self.__links_digest = links_digest
+
+        return new_months
+
+    def run(self, max_polls: int = None) -> None:
+        """
+        Poll the top page repeatedly. Errors in a poll are logged, and polling continues.
+
+        :param int max_polls: number of polls. If None passed, poll forever.
+        :return: None
+        """
+        count = 0
+        while max_polls is None or count < max_polls:
+            if count > 0:
+                time.sleep(self.__interval)
+            try:
+                self.poll()
+            except Exception:
+                logger.exception('failed to poll %s' % self.__menu_page)
+            count += 1
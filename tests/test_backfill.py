@@ -0,0 +1,91 @@
+import unittest
+import os
+import tempfile
+from unittest import mock
+import pandas as pd
+from econ_watcher_reader import backfill
+
+
+class _Reader(object):
+    """
+    Reader returns dummy data without accessing to the web site.
+    """
+    AVAILABLE_PERIOD = pd.Series(pd.date_range('2018-01-01', '2018-07-01', freq='MS')[::-1])
+    EARLIEST_MONTH = AVAILABLE_PERIOD.min()
+    LATEST_MONTH = AVAILABLE_PERIOD.max()
+
+    def get_data(self, kind_, start=None, end=None):
+        months = [month for month in self.AVAILABLE_PERIOD if start <= month <= end]
+        index = pd.MultiIndex.from_tuples(
+            [(month, 'Current', '東北', 1) for month in months],
+            names=['date', 'watcher_type', 'region', 'row_id']
+        )
+        return pd.DataFrame({'score': [3] * len(months)}, index=index).sort_index()
+
+
+class TestBackfill(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def test_workers_process_all_shards(self):
+        manifest = backfill.create_manifest(_Reader(), 'current', self.directory, shard_size=3)
+        self.assertEqual(len(manifest['shards']), 3)
+        self.assertEqual(manifest['shards'][0][0], '2018-01-01')
+
+        # the first worker already claimed shard 1
+        self.assertTrue(backfill._claim_shard(self.directory, 1, 'worker-a', 60))
+        self.assertListEqual(backfill.run_worker(_Reader(), self.directory, 'worker-b'), [0, 2])
+
+        with self.assertRaises(ValueError):
+            backfill.merge_shards(self.directory)
+
+        # abandoned claim is taken over
+        self.assertListEqual(backfill.run_worker(_Reader(), self.directory, 'worker-c', claim_timeout=-1), [1])
+
+        data = backfill.merge_shards(self.directory)
+        self.assertEqual(len(data), 7)
+        self.assertTrue(data.index.is_monotonic_increasing)
+
+    def test_claim_is_released_on_failure(self):
+        backfill.create_manifest(_Reader(), 'current', self.directory, shard_size=3)
+
+        class _FailingReader(_Reader):
+            def get_data(self, kind_, start=None, end=None):
+                raise IOError('failed to download')
+
+        with self.assertRaises(IOError):
+            backfill.run_worker(_FailingReader(), self.directory, 'worker-a')
+        self.assertListEqual(backfill.run_worker(_Reader(), self.directory, 'worker-b'), [0, 1, 2])
+
+    def test_claim_taken_over_is_not_released(self):
+        backfill.create_manifest(_Reader(), 'current', self.directory, shard_size=3)
+        directory = self.directory
+
+        class _TakenOverReader(_Reader):
+            def get_data(self, kind_, start=None, end=None):
+                # another worker takes over the claim while this worker is reading
+                backfill._claim_shard(directory, 0, 'worker-b', claim_timeout=-1)
+                raise IOError('failed to download')
+
+        with self.assertRaises(IOError):
+            backfill.run_worker(_TakenOverReader(), self.directory, 'worker-a')
+        with open(os.path.join(self.directory, 'shard-0000.claim')) as f:
+            self.assertEqual(f.read(), 'worker-b')
+
+    def test_existing_manifest_is_reused(self):
+        manifest = backfill.create_manifest(_Reader(), 'current', self.directory, shard_size=3)
+        self.assertDictEqual(backfill.create_manifest(_Reader(), 'future', self.directory, shard_size=2), manifest)
+        self.assertListEqual(os.listdir(self.directory), [backfill.MANIFEST_FILE_NAME])
+
+    def test_manifest_created_concurrently_is_not_overwritten(self):
+        manifest = backfill.create_manifest(_Reader(), 'current', self.directory, shard_size=3)
+
+        # another worker passed the existence check before the manifest was created
+        with mock.patch('os.path.exists', return_value=False):
+            self.assertDictEqual(backfill.create_manifest(_Reader(), 'future', self.directory, shard_size=2), manifest)
+        self.assertListEqual(os.listdir(self.directory), [backfill.MANIFEST_FILE_NAME])
+
+
+if __name__ == '__main__':
+    unittest.main()
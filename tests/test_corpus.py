@@ -0,0 +1,48 @@
+import unittest
+import tempfile
+import numpy as np
+import pandas as pd
+from econ_watcher_reader.corpus import export_sentence_corpus, SentenceCorpus
+
+
+class TestSentenceCorpus(unittest.TestCase):
+
+    def setUp(self):
+        index = pd.MultiIndex.from_tuples(
+            [(pd.Timestamp('2018-01-01'), 'Current', '東北', 1),
+             (pd.Timestamp('2018-01-01'), 'Current', '東北', 2),
+             (pd.Timestamp('2018-02-01'), 'Current', '', 1)],
+            names=['date', 'watcher_type', 'region', 'row_id']
+        )
+        self.data = pd.DataFrame({
+            'industry': ['百貨店', 'スーパー', '百貨店'],
+            'score': [4, 3, 0],
+            'reason_sentence': ['客が増えた', 'sales grew', '受注が減った'],
+        }, index=index)
+        self.directory = tempfile.mkdtemp()
+
+    def test_export_and_load(self):
+        export_sentence_corpus(self.data, self.directory)
+
+        with SentenceCorpus(self.directory) as corpus:
+            self.assertEqual(len(corpus), 3)
+            self.assertListEqual(list(corpus), ['客が増えた', 'sales grew', '受注が減った'])
+            self.assertEqual(corpus[-1], '受注が減った')
+            self.assertListEqual(corpus.score.tolist(), [4.0, 3.0, 0.0])
+            self.assertEqual(corpus.date[2], np.datetime64('2018-02-01'))
+            self.assertListEqual([corpus.categories('region')[code] for code in corpus.region], ['東北', '東北', ''])
+            self.assertListEqual([corpus.categories('industry')[code] for code in corpus.industry],
+                                 ['百貨店', 'スーパー', '百貨店'])
+            self.assertEqual(bytes(corpus.buffer[corpus.offsets[1]:corpus.offsets[2]]), b'sales grew')
+            with self.assertRaises(IndexError):
+                corpus[3]
+
+    def test_empty_data(self):
+        export_sentence_corpus(self.data.iloc[:0], self.directory)
+
+        with SentenceCorpus(self.directory) as corpus:
+            self.assertEqual(len(corpus), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,13 @@
 import unittest
+import datetime
+import os
+import tempfile
+from unittest import mock
 import pandas as pd
 import numpy as np
-from econ_watcher_reader.reader import EconomyWatcherReader
+from econ_watcher_reader.reader import EconomyWatcherReader, FailedMonth
+from econ_watcher_reader.scraper import DownloadScheduler
+from econ_watcher_reader.settings import WatcherType
 import logging
 logging.basicConfig()
 logging.getLogger("econ_watcher_reader.reader").setLevel(level=logging.DEBUG)
@@ -22,7 +28,8 @@ class TestReaderCurrent(unittest.TestCase):
         data = reader.get_data(self.kind_, pd.datetime(2015,10,1), None)
         # check column names
         self.assertSetEqual(set(data.columns),
-                            {'date', 'reason_type', 'industry', 'region', 'is_tokyo', 'field', 'score', 'reason_sentence'})
+                            {'reason_type', 'industry', 'is_tokyo', 'field', 'score', 'reason_sentence'})
+        self.assertListEqual(list(data.index.names), ['date', 'watcher_type', 'region', 'row_id'])
 
     def test_getting_data_for_multiple_months(self):
         reader = EconomyWatcherReader()
@@ -32,14 +39,35 @@ class TestReaderCurrent(unittest.TestCase):
         # check data range
         self.assertListEqual(
             list(pd.date_range(pd.datetime(2018, 1, 1), pd.datetime(2018,5,1), freq='MS').values),
-            list(np.sort(data.date.unique()))
+            list(np.sort(data.index.get_level_values('date').unique()))
         )
 
+        # check index is sorted and unique
+        self.assertTrue(data.index.is_unique)
+        self.assertTrue(data.index.is_monotonic_increasing)
+
+    def test_getting_data_for_multiple_periods(self):
+        reader = EconomyWatcherReader()
+
+        data = reader.get_data('current', periods=[
+            (pd.datetime(2017, 1, 1), pd.datetime(2017, 3, 1)),
+            (pd.datetime(2017, 2, 1), pd.datetime(2017, 4, 1)),
+            pd.datetime(2018, 1, 1),
+        ])
+
+        # check overlapped months are read only once
+        self.assertListEqual(
+            list(pd.date_range(pd.datetime(2017, 1, 1), pd.datetime(2017, 4, 1), freq='MS').values)
+            + [np.datetime64(pd.datetime(2018, 1, 1))],
+            list(np.sort(data.index.get_level_values('date').unique()))
+        )
+        self.assertTrue(data.index.is_unique)
+
     def test_getting_all_available_data(self):
         reader = EconomyWatcherReader()
         data = reader.get_data('current')
 
-        date_in_data_str = ['{:%Y%m%d}'.format(pd.to_datetime(date_)) for date_ in data.date.unique()]
+        date_in_data_str = ['{:%Y%m%d}'.format(pd.to_datetime(date_)) for date_ in data.index.get_level_values('date').unique()]
         self.assertIn('{:%Y%m%d}'.format(reader.EARLIEST_MONTH), date_in_data_str)
         self.assertIn('{:%Y%m%d}'.format(reader.LATEST_MONTH), date_in_data_str)
         self.assertGreater(len(date_in_data_str), 2)
@@ -66,6 +94,10 @@ class TestReaderCurrent(unittest.TestCase):
         with self.assertRaises(ValueError):
             reader.get_data(kind_='current', start=pd.datetime(2018, 1, 1), end=pd.datetime(2017,1,1))
 
+        # invalid `on_error` parameter
+        with self.assertRaises(ValueError):
+            reader.get_data(kind_='current', start=pd.datetime(2018, 1, 1), on_error='invalid')
+
 
 class TestReaderFuture(unittest.TestCase):
 
@@ -83,7 +115,8 @@ class TestReaderFuture(unittest.TestCase):
         # check column names
         data.to_clipboard()
         self.assertSetEqual(set(data.columns),
-                            {'date', 'industry', 'region', 'is_tokyo', 'field', 'score', 'reason_sentence'})
+                            {'industry', 'is_tokyo', 'field', 'score', 'reason_sentence'})
+        self.assertListEqual(list(data.index.names), ['date', 'watcher_type', 'region', 'row_id'])
 
     def test_getting_data_for_multiple_months(self):
         reader = EconomyWatcherReader()
@@ -93,14 +126,18 @@ class TestReaderFuture(unittest.TestCase):
         # check data range
         self.assertListEqual(
             list(pd.date_range(pd.datetime(2018, 1, 1), pd.datetime(2018,5,1), freq='MS').values),
-            list(np.sort(data.date.unique()))
+            list(np.sort(data.index.get_level_values('date').unique()))
         )
 
+        # check index is sorted and unique
+        self.assertTrue(data.index.is_unique)
+        self.assertTrue(data.index.is_monotonic_increasing)
+
     def test_getting_all_available_data(self):
         reader = EconomyWatcherReader()
         data = reader.get_data('current')
 
-        date_in_data_str = ['{:%Y%m%d}'.format(pd.to_datetime(date_)) for date_ in data.date.unique()]
+        date_in_data_str = ['{:%Y%m%d}'.format(pd.to_datetime(date_)) for date_ in data.index.get_level_values('date').unique()]
         self.assertIn('{:%Y%m%d}'.format(reader.EARLIEST_MONTH), date_in_data_str)
         self.assertIn('{:%Y%m%d}'.format(reader.LATEST_MONTH), date_in_data_str)
         self.assertGreater(len(date_in_data_str), 2)
@@ -127,6 +164,138 @@ class TestReaderFuture(unittest.TestCase):
         with self.assertRaises(ValueError):
             reader.get_data(kind_='current', start=pd.datetime(2018, 1, 1), end=pd.datetime(2017,1,1))
 
+        # invalid `on_error` parameter
+        with self.assertRaises(ValueError):
+            reader.get_data(kind_='current', start=pd.datetime(2018, 1, 1), on_error='invalid')
+
+
+class TestReaderOffline(unittest.TestCase):
+    """
+    Tests with raw data made in the test, without accessing to the web site.
+    """
+    # published in the next month of the data
+    LINKS = ['2018/0{}08watcher/'.format(month) for month in range(2, 8)]
+
+    def setUp(self):
+        self.downloaded = []
+        self.broken_links = set()
+        self.failing_links = set()
+
+        with mock.patch('econ_watcher_reader.scraper.get_watcher_directory', return_value=self.LINKS):
+            self.reader = EconomyWatcherReader(scheduler=DownloadScheduler(rate=100))
+        patcher = mock.patch('econ_watcher_reader.scraper.get_watcher_file', side_effect=self._get_watcher_file)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _get_watcher_file(self, link_, file_name, scheduler=None):
+        self.downloaded.append(link_)
+        if link_ in self.failing_links:
+            raise IOError('failed to download')
+
+        data = pd.DataFrame([
+            ['北海道', np.nan, np.nan, np.nan, np.nan, np.nan],
+            ['家計動向関連(東北)', np.nan, '◎', '百貨店', '来客数の動き', '・客が増えた'],
+            [np.nan, '東京都', '○', 'スーパー', '販売量の動き', '・売上が伸びた'],
+        ])
+        if link_ in self.broken_links:
+            # sentence is missing in a row with score
+            data.iloc[2, 5] = np.nan
+        return data
+
+    def test_skip_failed_months_and_resume_from_checkpoint(self):
+        checkpoint_dir = tempfile.mkdtemp()
+        self.failing_links = {'2018/0408watcher/'}
+
+        data = self.reader.get_data('current', datetime.datetime(2018, 1, 1), datetime.datetime(2018, 6, 1),
+                                    on_error='skip', checkpoint_dir=checkpoint_dir)
+
+        self.assertListEqual([(failed.month, failed.watcher_type) for failed in self.reader.failed_months],
+                             [(pd.Timestamp(2018, 3, 1), WatcherType.Current)])
+        self.assertIsInstance(self.reader.failed_months[0], FailedMonth)
+        self.assertNotIn(pd.Timestamp(2018, 3, 1), data.index.get_level_values('date'))
+        self.assertEqual(len(data), 10)
+
+        # only the failed month is downloaded again
+        self.downloaded, self.failing_links = [], set()
+        data = self.reader.get_data('current', datetime.datetime(2018, 1, 1), datetime.datetime(2018, 6, 1),
+                                    on_error='skip', checkpoint_dir=checkpoint_dir)
+
+        self.assertListEqual(self.downloaded, ['2018/0408watcher/'])
+        self.assertListEqual(self.reader.failed_months, [])
+        self.assertEqual(len(data), 12)
+        # raw data are removed after parsed
+        self.assertListEqual(sorted(os.listdir(checkpoint_dir)),
+                             ['Current-2018{:02d}.pkl'.format(month) for month in range(1, 7)])
+
+    def test_checkpoint_is_kept_when_raised(self):
+        checkpoint_dir = tempfile.mkdtemp()
+        self.failing_links = {'2018/0408watcher/'}
+
+        with self.assertRaises(IOError):
+            self.reader.get_data('current', datetime.datetime(2018, 1, 1), datetime.datetime(2018, 6, 1),
+                                 checkpoint_dir=checkpoint_dir)
+
+        self.downloaded, self.failing_links = [], set()
+        data = self.reader.get_data('current', datetime.datetime(2018, 1, 1), datetime.datetime(2018, 6, 1),
+                                    checkpoint_dir=checkpoint_dir)
+
+        self.assertListEqual(self.downloaded, ['2018/0408watcher/'])
+        self.assertEqual(len(data), 12)
+
+    def test_skip_months_failed_to_parse(self):
+        self.broken_links = {'2018/0508watcher/'}
+
+        data = self.reader.get_data('current', datetime.datetime(2018, 1, 1), datetime.datetime(2018, 6, 1),
+                                    on_error='skip')
+
+        self.assertListEqual([failed.month for failed in self.reader.failed_months], [pd.Timestamp(2018, 4, 1)])
+        self.assertIsInstance(self.reader.failed_months[0].error, TypeError)
+        self.assertEqual(len(data), 10)
+
+        with self.assertRaises(TypeError):
+            self.reader.get_data('current', datetime.datetime(2018, 1, 1), datetime.datetime(2018, 6, 1))
+
+    def test_multiple_periods(self):
+        data = self.reader.get_data('current', periods=[
+            (datetime.datetime(2018, 1, 1), datetime.datetime(2018, 3, 1)),
+            [datetime.datetime(2018, 2, 1), datetime.datetime(2018, 4, 1)],
+            datetime.datetime(2018, 3, 15),
+            datetime.datetime(2018, 6, 1),
+        ])
+
+        # overlapped months are downloaded only once
+        self.assertListEqual(sorted(self.downloaded), [self.LINKS[i] for i in [0, 1, 2, 3, 5]])
+        self.assertListEqual(
+            list(data.index.get_level_values('date').unique()),
+            [pd.Timestamp(2018, month, 1) for month in [1, 2, 3, 4, 6]]
+        )
+        self.assertTrue(data.index.is_unique)
+
+    def test_invalid_periods(self):
+        with self.assertRaises(ValueError):
+            self.reader.get_data('current', start=datetime.datetime(2018, 1, 1),
+                                 periods=[datetime.datetime(2018, 2, 1)])
+
+        with self.assertRaises(ValueError):
+            self.reader.get_data('current', periods=[[datetime.datetime(2018, 1, 1)]])
+
+        with self.assertRaises(ValueError):
+            self.reader.get_data('current', periods=[(datetime.datetime(2018, 3, 1), datetime.datetime(2018, 1, 1))])
+
+        self.assertListEqual(self.downloaded, [])
+
+    def test_available_period_is_kept_on_invalid_links(self):
+        with self.assertRaises(ValueError):
+            self.reader.refresh_available_period([])
+
+        self.assertEqual(self.reader.EARLIEST_MONTH, pd.Timestamp(2018, 1, 1))
+        self.assertEqual(self.reader.LATEST_MONTH, pd.Timestamp(2018, 6, 1))
+        self.assertEqual(len(self.reader.get_data('current', datetime.datetime(2018, 2, 1))), 2)
+
+    def test_invalid_on_error(self):
+        with self.assertRaises(ValueError):
+            self.reader.get_data('current', datetime.datetime(2018, 1, 1), on_error='invalid')
+
 
 if __name__ == '__main__':
     unittest.main()
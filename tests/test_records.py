@@ -0,0 +1,56 @@
+import unittest
+import datetime
+import subprocess
+import sys
+from unittest import mock
+import requests
+from econ_watcher_reader.settings import WatcherType
+from econ_watcher_reader import records
+
+
+RAW_CSV = '\r\n'.join([
+    '北海道,,,,,',
+    '家計動向関連(東北),,◎,百貨店,来客数の動き,"・客が増えた\n"',
+    ',東京都,○,スーパー,販売量の動き,・売上が伸びた',
+    ',,□,コンビニ,単価の動き,*',
+    '企業動向関連,,×,製造業,取引先の様子,・受注が減った',
+    ',,,,,',
+]).encode('cp932')
+
+
+class TestRecords(unittest.TestCase):
+
+    def test_parse_records(self):
+        parsed = records.parse_records(RAW_CSV, WatcherType.Current, datetime.datetime(2018, 1, 1))
+
+        self.assertListEqual([record.row_id for record in parsed], [1, 2, 4])
+        self.assertListEqual([record.region for record in parsed], ['東北', '東北', ''])
+        self.assertListEqual([record.field for record in parsed], ['家計動向関連', '家計動向関連', '企業動向関連'])
+        self.assertListEqual([record.is_tokyo for record in parsed], [False, True, False])
+        self.assertListEqual([record.score for record in parsed], [4, 3, 0])
+        self.assertListEqual([record.reason_sentence for record in parsed], ['客が増えた', '売上が伸びた', '受注が減った'])
+
+    def test_to_columns(self):
+        columns = records.to_columns(records.parse_records(RAW_CSV, WatcherType.Current, datetime.datetime(2018, 1, 1)))
+
+        self.assertListEqual(list(columns), list(records.WatcherRecord._fields))
+        self.assertListEqual(columns['industry'], ['百貨店', 'スーパー', '製造業'])
+
+    def test_raise_on_error_response(self):
+        response = requests.Response()
+        response.status_code = 404
+        response._content = '<html>見つかりません</html>'.encode('utf-8')
+
+        with mock.patch('econ_watcher_reader.scraper.get_watcher_directory', return_value=['2018/0208watcher/']):
+            reader = records.RecordReader()
+        with mock.patch('requests.get', return_value=response):
+            with self.assertRaises(requests.HTTPError):
+                reader.get_records('current')
+
+    def test_pandas_is_not_imported(self):
+        code = 'import sys, econ_watcher_reader.records; sys.exit("pandas" in sys.modules)'
+        self.assertEqual(subprocess.call([sys.executable, '-c', code]), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,12 @@
 import unittest
 from econ_watcher_reader.settings import TOP_MENU_PAGE, WatcherType, TOKYO_FLAG_VALUE_IN_RAW_DATA
 import re
+import threading
+import requests
 import numpy as np
+import pandas as pd
 from econ_watcher_reader.scraper import get_watcher_directory, get_watcher_file,\
-    get_publish_date_from_url
+    get_publish_date_from_url, DownloadScheduler
 import econ_watcher_reader.parser as parser
 import logging
 logging.basicConfig()
@@ -31,6 +34,99 @@ class TestScraper(unittest.TestCase):
         self.assertIsNotNone(get_publish_date_from_url(links_[0]))
 
 
+class TestDownloadScheduler(unittest.TestCase):
+
+    class _Response(object):
+        def __init__(self, status_code):
+            self.status_code = status_code
+            self.content = b'content'
+            self.headers = {}
+
+        def raise_for_status(self):
+            if self.status_code >= 400:
+                raise RuntimeError(self.status_code)
+
+    class _Session(object):
+        def __init__(self, status_codes):
+            self.status_codes = list(status_codes)
+
+        def get(self, url, timeout=None):
+            status_code = self.status_codes.pop(0)
+            if status_code is None:
+                raise requests.ReadTimeout()
+            if isinstance(status_code, Exception):
+                raise status_code
+            return TestDownloadScheduler._Response(status_code)
+
+    def test_retry_on_throttling(self):
+        scheduler = DownloadScheduler(rate=100, retry_backoff_seconds=0, session=self._Session([429, 503, 200]))
+        self.assertEqual(scheduler.fetch(TOP_MENU_PAGE), b'content')
+
+    def test_retry_on_timeout(self):
+        scheduler = DownloadScheduler(rate=100, retry_backoff_seconds=0, session=self._Session([None, 200]))
+        self.assertEqual(scheduler.fetch(TOP_MENU_PAGE), b'content')
+
+    def test_fetch_after_unexpected_error(self):
+        scheduler = DownloadScheduler(rate=100, retry_backoff_seconds=0,
+                                      session=self._Session([requests.exceptions.ChunkedEncodingError(), 200]))
+        with self.assertRaises(requests.exceptions.ChunkedEncodingError):
+            scheduler.fetch(TOP_MENU_PAGE)
+
+        # the concurrency slot is released, so that the next fetch does not wait forever
+        result = []
+        thread = threading.Thread(target=lambda: result.append(scheduler.fetch(TOP_MENU_PAGE)), daemon=True)
+        thread.start()
+        thread.join(timeout=5)
+        self.assertListEqual(result, [b'content'])
+
+    def test_raise_after_max_retries(self):
+        scheduler = DownloadScheduler(rate=100, max_retries=1, retry_backoff_seconds=0,
+                                      session=self._Session([503, 503]))
+        with self.assertRaises(RuntimeError):
+            scheduler.fetch(TOP_MENU_PAGE)
+
+    def test_map_keeps_order(self):
+        scheduler = DownloadScheduler(rate=100, session=self._Session([200] * 5))
+        self.assertListEqual(scheduler.map(lambda x: x * 2, range(5)), [0, 2, 4, 6, 8])
+
+    def test_map_applies_to_all_items_before_raising(self):
+        scheduler = DownloadScheduler(rate=100, max_concurrency=2)
+        applied = []
+
+        def _func(x):
+            applied.append(x)
+            if x in (1, 3):
+                raise ValueError(x)
+            return x
+
+        with self.assertRaises(ValueError) as context:
+            scheduler.map(_func, range(10))
+        self.assertEqual(context.exception.args, (1,))
+        self.assertListEqual(sorted(applied), list(range(10)))
+
+
+class TestFieldTransform(unittest.TestCase):
+
+    def test_region_and_field_from_unique_values(self):
+        data = pd.DataFrame({'field': ['家計動向関連(東北)', np.nan, '家計動向関連(東北)', '企業動向関連']},
+                            index=[3, 1, 2, 0])
+        data = parser.make_region_column(data)
+        data = parser.clean_field_column(data)
+
+        self.assertListEqual(data.index.tolist(), [3, 1, 2, 0])
+        self.assertListEqual(data.region.fillna('').tolist(), ['東北', '', '東北', ''])
+        self.assertListEqual(data.field.fillna('').tolist(), ['家計動向関連', '', '家計動向関連', '企業動向関連'])
+
+    def test_make_field_column_not_filled_across_groups(self):
+        data = pd.concat(
+            [pd.DataFrame({0: ['北海道', np.nan]}), pd.DataFrame({0: [np.nan, '東北']})],
+            keys=['2018-01', '2018-02'], names=['date', 'row_id']
+        )
+        data_with_field = parser.make_field_column(data, 0, group_level='date')
+
+        self.assertListEqual(data_with_field.field.fillna('').tolist(), ['北海道', '北海道', '', '東北'])
+
+
 class TestParserCurrent(unittest.TestCase):
 
     @classmethod
@@ -0,0 +1,86 @@
+import unittest
+from unittest import mock
+import pandas as pd
+from econ_watcher_reader.watch import PublicationWatcher
+
+
+class _Reader(object):
+    """
+    Reader refreshes available period from passed links without accessing to the web site.
+    """
+    def __init__(self, links_):
+        self.refresh_available_period(links_)
+
+    def refresh_available_period(self, links_):
+        self.AVAILABLE_PERIOD = pd.Series([pd.Timestamp(link_) for link_ in links_])
+
+    def get_data(self, kind_, start=None, end=None):
+        return pd.DataFrame({'kind': [kind_], 'date': [start]})
+
+
+class TestPublicationWatcher(unittest.TestCase):
+
+    def test_callback_only_for_new_month(self):
+        received = []
+        watcher = PublicationWatcher(_Reader(['2018-01-01']), 'current', lambda month, data: received.append(month),
+                                     interval=0)
+
+        responses = [
+            (['2018-01-01'], 'etag-1', None),
+            (None, 'etag-1', None),
+            (['2018-02-01', '2018-01-01'], 'etag-2', None),
+            (['2018-01-01', '2018-02-01'], 'etag-3', None),
+        ]
+        with mock.patch('econ_watcher_reader.scraper.get_watcher_directory_if_modified',
+                        side_effect=responses) as get_links:
+            watcher.run(max_polls=4)
+
+        self.assertListEqual(received, [pd.Timestamp('2018-02-01')])
+        # ETag of the previous response is sent
+        self.assertEqual(get_links.call_args_list[1][0][1], 'etag-1')
+
+    def test_retry_after_failure(self):
+        received = []
+        reader = _Reader(['2018-01-01'])
+        watcher = PublicationWatcher(reader, 'current', lambda month, data: received.append(month), interval=0)
+
+        responses = [
+            ConnectionError('failed to connect'),
+            (['2018-01-01', '2018-02-01'], 'etag-1', None),
+            (['2018-01-01', '2018-02-01'], 'etag-1', None),
+        ]
+        with mock.patch('econ_watcher_reader.scraper.get_watcher_directory_if_modified',
+                        side_effect=responses) as get_links,\
+                mock.patch.object(reader, 'get_data', side_effect=[IOError('failed to download'), pd.DataFrame()]):
+            watcher.run(max_polls=3)
+
+        self.assertListEqual(received, [pd.Timestamp('2018-02-01')])
+        # ETag is not sent until the new month is delivered
+        self.assertIsNone(get_links.call_args_list[2][0][1])
+
+    def test_ignore_page_without_links(self):
+        received = []
+        reader = _Reader(['2018-01-01'])
+        watcher = PublicationWatcher(reader, 'current', lambda month, data: received.append(month), interval=0)
+
+        responses = [
+            ([], 'etag-maintenance', None),
+            (['2018-01-01', '2018-02-01'], 'etag-1', None),
+        ]
+        with mock.patch('econ_watcher_reader.scraper.get_watcher_directory_if_modified',
+                        side_effect=responses) as get_links,\
+                mock.patch.object(reader, 'refresh_available_period',
+                                  wraps=reader.refresh_available_period) as refresh:
+            watcher.poll()
+            refresh.assert_not_called()
+            self.assertIsNone(get_links.call_args_list[0][0][1])
+
+            watcher.poll()
+
+        # ETag of the maintenance page is not sent
+        self.assertIsNone(get_links.call_args_list[1][0][1])
+        self.assertListEqual(received, [pd.Timestamp('2018-02-01')])
+
+
+if __name__ == '__main__':
+    unittest.main()